@@ -2,12 +2,94 @@
 # copied from clouddrift
 import xarray as xr
 import numpy as np
+import os
+
 from collections.abc import Callable
+from functools import partial
+from itertools import chain
 from typing import Tuple, Optional
-from tqdm import tqdm
+from tqdm.contrib.concurrent import process_map, thread_map
+import numba as nb
 import warnings
 
 
+def _load_trajectory(
+    index,
+    preprocess_func: Callable[[int], xr.Dataset],
+    name_coords: list,
+    name_meta: list,
+    name_data: list,
+    kwargs: dict,
+) -> Tuple[dict, dict, dict]:
+    """Read one trajectory file and return its arrays keyed by variable name.
+
+    Module-level so that it stays picklable for a process pool.
+    """
+    with preprocess_func(index, **kwargs) as ds:
+        # fetch each variable once and collapse it to a plain ndarray here,
+        # so the scatter works on numpy buffers instead of re-entering xarray
+        obs = {var: np.asarray(ds[var].data) for var in name_coords}
+        meta = {var: ds[var].data[0] for var in name_meta}
+
+        data = {}
+        for var in name_data:
+            if var in ds.variables:
+                data[var] = np.asarray(ds[var].data)
+            else:
+                warnings.warn(f"Variable {var} requested but not found; skipping.")
+
+    return obs, meta, data
+
+
+@nb.jit(nopython=True, parallel=True, cache=False)
+def _scatter_numba(out, parts, offsets):
+    """Copy every part to its own offset in out, trajectories in parallel"""
+    # range over the offsets array, not the typed list, and re-sign the
+    # loop variable: prange indices type as uint64 and indexing with
+    # them triggers a user-visible NumbaTypeSafetyWarning on the cast
+    for k in nb.prange(len(offsets)):
+        i = np.int64(k)
+        arr = parts[i]
+        oid = offsets[i]
+        for j in range(arr.size):
+            out[oid + j] = arr[j]
+
+
+@nb.jit(nopython=True, cache=False)
+def _split_views(ragged_array, cuts):
+    """Build one zero-copy view per row inside compiled code.
+
+    Equivalent to np.split but without the per-row interpreter dispatch
+    and Python slice objects.
+    """
+    res = []
+    start = 0
+    for i in range(cuts.size):
+        res.append(ragged_array[start : cuts[i]])
+        start = cuts[i]
+    return res
+
+
+def _fill_ragged(out: np.ndarray, parts: list, offsets: np.ndarray):
+    """Scatter the per-trajectory parts into the flat destination array.
+
+    Each part lands at its own offset, so parts may come in any order.
+    Numeric dtypes go through the numba-parallel copy; dtypes numba cannot
+    hold (datetime64, strings, ...) fall back to slice assignments.
+    """
+    if out.dtype.kind in "biuf":
+        # the typed list needs homogeneous dtypes, so cast parts up front
+        # where slice assignment used to cast silently during the copy;
+        # np.asarray is free when dtype already matches and also strips
+        # ndarray subclasses (np.memmap) numba rejects, while still
+        # sharing the same buffer
+        parts = [np.asarray(arr, dtype=out.dtype) for arr in parts]
+        _scatter_numba(np.asarray(out), nb.typed.List(parts), offsets)
+    else:
+        for arr, oid in zip(parts, offsets):
+            out[oid : oid + arr.size] = arr
+
+
 class RaggedArray:
     def __init__(
         self,
@@ -32,7 +114,9 @@ class RaggedArray:
         name_coords: list,
         name_meta: Optional[list] = [],
         name_data: Optional[list] = [],
-        rowsize_func: Optional[Callable[[int], int]] = None,
+        n_workers: Optional[int] = None,
+        use_processes: Optional[bool] = False,
+        mmap_dir: Optional[str] = None,
         **kwargs,
     ):
         """Generate ragged arrays archive from a list of trajectory files
@@ -43,25 +127,22 @@ class RaggedArray:
             name_coords (list): Name of the coordinate variables to include in the archive
             name_meta (list, optional): Name of metadata variables to include in the archive (Defaults to [])
             name_data (list, optional): Name of the data variables to include in the archive (Defaults to [])
-            rowsize_func (Optional[Callable[[int], int]], optional): returns the number of observations from an identification number (to speed up processing) (Defaults to None)
+            n_workers (int, optional): number of workers reading files concurrently (Defaults to None, i.e. the executor default)
+            use_processes (bool, optional): read with a process pool instead of a thread pool; only useful when preprocess_func is pure Python and does not release the GIL (Defaults to False)
+            mmap_dir (str, optional): directory for one memory-mapped file per observation variable; the flat arrays then live on disk instead of RAM (Defaults to None, i.e. in-memory arrays)
 
         Returns:
             obj: ragged array class object
         """
-        # if no method is supplied, get the dimension from the preprocessing function
-        rowsize_func = (
-            rowsize_func
-            if rowsize_func
-            else lambda i, **kwargs: preprocess_func(i, **kwargs).dims["obs"]
-        )
-        rowsize = cls.number_of_observations(rowsize_func, indices, **kwargs)
         coords, metadata, data = cls.allocate(
             preprocess_func,
             indices,
-            rowsize,
             name_coords,
             name_meta,
             name_data,
+            n_workers,
+            use_processes,
+            mmap_dir,
             **kwargs,
         )
         attrs_global, attrs_variables = cls.attributes(
@@ -74,18 +155,106 @@ class RaggedArray:
         return cls(coords, metadata, data, attrs_global, attrs_variables)
 
     @classmethod
-    def from_netcdf(cls, filename: str):
+    def from_files_delayed(
+        cls,
+        indices: list,
+        preprocess_func: Callable[[int], xr.Dataset],
+        name_coords: list,
+        name_meta: Optional[list] = [],
+        name_data: Optional[list] = [],
+        rowsize_func: Optional[Callable[[int], int]] = None,
+        **kwargs,
+    ):
+        """Generate a lazy ragged arrays archive backed by dask (out-of-core).
+
+        Each observation variable becomes a dask array with one chunk per
+        trajectory file, built from delayed reads, so archives larger than
+        memory can be assembled and streamed to disk chunk by chunk through
+        to_xarray()/to_netcdf(). Metadata variables hold one value per
+        trajectory and are computed eagerly in a single graph, which opens
+        each file once. Requires dask.
+
+        Args:
+            indices (list): identification numbers list to iterate
+            preprocess_func (Callable[[int], xr.Dataset]): returns a processed xarray Dataset from an identification number
+            name_coords (list): Name of the coordinate variables to include in the archive
+            name_meta (list, optional): Name of metadata variables to include in the archive (Defaults to [])
+            name_data (list, optional): Name of the data variables to include in the archive (Defaults to [])
+            rowsize_func (Optional[Callable[[int], int]], optional): returns the number of observations from an identification number without reading the data; if given, the chunk sizes are known up front, which serializers like to_netcdf require (Defaults to None, i.e. unknown chunk sizes)
+
+        Returns:
+            obj: ragged array class object with dask-backed observation variables
+        """
+        import dask
+        import dask.array as dsa
+
+        # probe one file for dtypes and attributes
+        with preprocess_func(indices[0], **kwargs) as ds:
+            attrs_global, attrs_variables = cls.attributes(
+                ds, name_coords, name_meta, name_data
+            )
+            dtypes = {
+                var: ds[var].dtype
+                for var in name_coords + name_meta + name_data
+                if var in ds.variables
+            }
+
+        if rowsize_func is not None:
+            rowsize = [rowsize_func(index, **kwargs) for index in indices]
+        else:
+            rowsize = [np.nan] * len(indices)
+
+        delayed_files = [
+            dask.delayed(preprocess_func)(index, **kwargs) for index in indices
+        ]
+
+        def ragged(var):
+            return dsa.concatenate(
+                [
+                    dsa.from_delayed(d[var].data, shape=(size,), dtype=dtypes[var])
+                    for d, size in zip(delayed_files, rowsize)
+                ]
+            )
+
+        coords = {var: ragged(var) for var in name_coords}
+        data = {var: ragged(var) for var in name_data if var in dtypes}
+
+        metadata = {}
+        if name_meta:
+            values = dask.compute(
+                [[d[var].data[0] for var in name_meta] for d in delayed_files]
+            )[0]
+            for k, var in enumerate(name_meta):
+                metadata[var] = np.array(
+                    [row[k] for row in values], dtype=dtypes[var]
+                )
+
+        return cls(coords, metadata, data, attrs_global, attrs_variables)
+
+    @classmethod
+    def from_netcdf(cls, filename: str, engine: str = "h5netcdf"):
         """Read a ragged arrays archive from a NetCDF file.
 
-        This is a thin wrapper around from_xarray().
+        This is a thin wrapper around from_xarray(). The file is opened
+        through h5netcdf, which reads the flat arrays via h5py without the
+        netCDF4-C global lock, and with chunks=None so the variables load
+        as plain numpy arrays rather than dask graphs; when h5netcdf is
+        not installed, this falls back to xarray's default engine.
 
         Args:
             filename (str): filename of NetCDF archive
+            engine (str, optional): engine used by xarray to open the file (Defaults to "h5netcdf")
 
         Returns:
             obj: ragged array class object
         """
-        return cls.from_xarray(xr.open_dataset(filename))
+        if engine == "h5netcdf":
+            try:
+                import h5netcdf  # noqa: F401
+            except ImportError:
+                engine = None  # let xarray pick its default engine
+
+        return cls.from_xarray(xr.open_dataset(filename, engine=engine, chunks=None))
 
     @classmethod
     def from_xarray(cls, ds: xr.Dataset, dim_traj: str = "traj", dim_obs: str = "obs"):
@@ -108,50 +277,28 @@ class RaggedArray:
         attrs_global = ds.attrs
 
         for var in ds.coords.keys():
-            coords[var] = ds[var].data
-            attrs_variables[var] = ds[var].attrs
+            da = ds[var]
+            coords[var] = da.data
+            attrs_variables[var] = da.attrs
 
         for var in ds.data_vars.keys():
-            if len(ds[var]) == ds.dims[dim_traj]:
-                metadata[var] = ds[var].data
-            elif len(ds[var]) == ds.dims[dim_obs]:
-                data[var] = ds[var].data
+            da = ds[var]
+            if dim_traj in da.dims and dim_obs not in da.dims:
+                metadata[var] = da.data
+            elif dim_obs in da.dims:
+                data[var] = da.data
             else:
                 warnings.warn(
                     f"""
-                    Variable '{var}' has unknown dimension size of 
-                    {len(ds[var])}, which is not traj={ds.dims[dim_traj]} or 
-                    obs={ds.dims[dim_obs]}; skipping.
+                    Variable '{var}' has unknown dimensions
+                    {da.dims}, which include neither '{dim_traj}' nor
+                    '{dim_obs}'; skipping.
                     """
                 )
-            attrs_variables[var] = ds[var].attrs
+            attrs_variables[var] = da.attrs
 
         return cls(coords, metadata, data, attrs_global, attrs_variables)
 
-    @staticmethod
-    def number_of_observations(
-        rowsize_func: Callable[[int], int], indices: list, **kwargs
-    ) -> np.array:
-        """Iterate through the files and evaluate the number of observations.
-
-        Args:
-            rowsize_func (Callable[[int], int]): returns number observations of a trajectory from its identification number
-            indices (list): identification numbers list to iterate
-
-        Returns:
-            np.array: number of observations of each trajectory
-        """
-        rowsize = np.zeros(len(indices), dtype="int")
-
-        for i, index in tqdm(
-            enumerate(indices),
-            total=len(indices),
-            desc="Retrieving the number of obs",
-            ncols=80,
-        ):
-            rowsize[i] = rowsize_func(index, **kwargs)
-        return rowsize
-
     @staticmethod
     def attributes(
         ds: xr.Dataset, name_coords: list, name_meta: list, name_data: list
@@ -169,12 +316,14 @@ class RaggedArray:
         """
         attrs_global = ds.attrs
 
-        # coordinates, metadata, and data
-        attrs_variables = {}
-        for var in name_coords + name_meta + name_data:
-            if var in ds.keys():
-                attrs_variables[var] = ds[var].attrs
-            else:
+        # coordinates, metadata, and data in one merged mapping
+        names = name_coords + name_meta + name_data
+        attrs_variables = {
+            var: ds[var].attrs for var in names if var in ds.variables
+        }
+
+        for var in names:
+            if var not in attrs_variables:
                 warnings.warn(f"Variable {var} requested but not found; skipping.")
 
         return attrs_global, attrs_variables
@@ -183,85 +332,114 @@ class RaggedArray:
     def allocate(
         preprocess_func: Callable[[int], xr.Dataset],
         indices: list,
-        rowsize: list,
         name_coords: list,
         name_meta: list,
         name_data: list,
+        n_workers: Optional[int] = None,
+        use_processes: Optional[bool] = False,
+        mmap_dir: Optional[str] = None,
         **kwargs,
     ) -> Tuple[dict, dict, dict]:
-        """Iterate through the files and fill for the ragged array associated with coordinates, and selected metadata and data variables.
+        """Read each file once and fill the ragged array associated with coordinates, and selected metadata and data variables.
 
         Args:
             preprocess_func (Callable[[int], xr.Dataset]): returns a processed xarray Dataset from an identification number
             indices (list): list of indices separating trajectory in the ragged arrays
-            rowsize (list): list of the number of observations per trajectory
             name_coords (list): Name of the coordinate variables to include in the archive
             name_meta (list, optional): Name of metadata variables to include in the archive (Defaults to [])
             name_data (list, optional): Name of the data variables to include in the archive (Defaults to [])
+            n_workers (int, optional): number of workers reading files concurrently (Defaults to None, i.e. the executor default)
+            use_processes (bool, optional): read with a process pool instead of a thread pool; preprocess_func must then be picklable (Defaults to False)
+            mmap_dir (str, optional): directory for one memory-mapped file per observation variable; the flat arrays then live on disk instead of RAM (Defaults to None, i.e. in-memory arrays)
 
         Returns:
             Tuple[dict, dict, dict]: dictionaries containing numerical data and attributes of coordinates, metadata and data variables.
         """
 
-        # open one file to get dtype of variables
-        ds = preprocess_func(indices[0], **kwargs)
-        nb_traj = len(rowsize)
-        nb_obs = np.sum(rowsize).astype("int")
-        index_traj = np.insert(np.cumsum(rowsize), 0, 0)
+        def destination(var, dtype):
+            if mmap_dir is None:
+                return np.empty(nb_obs, dtype=dtype)
+            return np.memmap(
+                os.path.join(mmap_dir, f"{var}.dat"),
+                dtype=dtype,
+                mode="w+",
+                shape=(int(nb_obs),),
+            )
+
+        # single streaming pass: read every file once, keep its arrays, and
+        # size the ragged destinations from what was actually read
+        mapper = process_map if use_processes else thread_map
+        per_file = mapper(
+            partial(
+                _load_trajectory,
+                preprocess_func=preprocess_func,
+                name_coords=name_coords,
+                name_meta=name_meta,
+                name_data=name_data,
+                kwargs=kwargs,
+            ),
+            indices,
+            max_workers=n_workers,
+            desc="Filling the Ragged Array",
+            ncols=80,
+        )
+
+        rowsize = np.fromiter(
+            (obs[name_coords[0]].size for obs, _, _ in per_file),
+            dtype="int",
+            count=len(per_file),
+        )
+
+        # offsets buffer [0, cumsum(rowsize)] filled in place, without the
+        # two temporaries np.insert(np.cumsum(...), 0, 0) allocates
+        index_traj = np.empty(rowsize.size + 1, dtype=np.intp)
+        index_traj[0] = 0
+        np.cumsum(rowsize, out=index_traj[1:])
+
+        nb_obs = int(index_traj[-1])
+
+        # schedule the copies longest trajectories first so the parallel
+        # workers stay balanced; every part keeps its own destination
+        # offset, so the archive layout is unchanged
+        order = np.argsort(rowsize, kind="stable")[::-1]
+        offsets = index_traj[order]
+
+        # one parallel copy per variable instead of one slice assignment
+        # per (trajectory, variable)
+        first_obs, first_meta, first_data = per_file[0]
 
-        # allocate memory
         coords = {}
         for var in name_coords:
-            coords[var] = np.zeros(nb_obs, dtype=ds[var].dtype)
+            coords[var] = destination(var, first_obs[var].dtype)
+            _fill_ragged(
+                coords[var], [per_file[k][0][var] for k in order], offsets
+            )
 
         metadata = {}
         for var in name_meta:
-            metadata[var] = np.zeros(nb_traj, dtype=ds[var].dtype)
+            metadata[var] = np.array(
+                [meta[var] for _, meta, _ in per_file],
+                dtype=np.asarray(first_meta[var]).dtype,
+            )
 
         data = {}
-        for var in name_data:
-            if var in ds.keys():
-                data[var] = np.zeros(nb_obs, dtype=ds[var].dtype)
-            else:
-                warnings.warn(f"Variable {var} requested but not found; skipping.")
-        ds.close()
-
-        # loop and fill the ragged array
-        for i, index in tqdm(
-            enumerate(indices),
-            total=len(indices),
-            desc="Filling the Ragged Array",
-            ncols=80,
-        ):
-            with preprocess_func(index, **kwargs) as ds:
-                size = rowsize[i]
-                oid = index_traj[i]
-
-                for var in name_coords:
-                    coords[var][oid : oid + size] = ds[var].data
-
-                for var in name_meta:
-                    metadata[var][i] = ds[var][0].data
-
-                for var in name_data:
-                    if var in ds.keys():
-                        data[var][oid : oid + size] = ds[var].data
-                    else:
-                        warnings.warn(
-                            f"Variable {var} requested but not found; skipping."
-                        )
+        for var in first_data:
+            dtype = first_data[var].dtype
+            parts = [
+                per_file[k][2][var]
+                if var in per_file[k][2]
+                else np.zeros(rowsize[k], dtype=dtype)
+                for k in order
+            ]
+            data[var] = destination(var, dtype)
+            _fill_ragged(data[var], parts, offsets)
 
         return coords, metadata, data
 
     def validate_attributes(self):
         """Validate that each variable has an assigned attribute tag."""
-        for key in (
-            list(self.coords.keys())
-            + list(self.metadata.keys())
-            + list(self.data.keys())
-        ):
-            if key not in self.attrs_variables:
-                self.attrs_variables[key] = {}
+        for key in chain(self.coords, self.metadata, self.data):
+            self.attrs_variables.setdefault(key, {})
 
     def to_xarray(self):
         """Convert ragged array object to a xarray Dataset.
@@ -283,15 +461,32 @@ class RaggedArray:
 
         return xr.Dataset(coords=xr_coords, data_vars=xr_data, attrs=self.attrs_global)
 
-    def to_netcdf(self, filename: str):
+    def to_netcdf(self, filename: str, engine: str = "h5netcdf", **kwargs):
         """Export ragged array object to a NetCDF archive.
 
+        The h5netcdf engine writes through h5py, which avoids the netCDF4-C
+        global lock and is noticeably faster for large flat arrays; when
+        h5netcdf is not installed, this falls back to xarray's default
+        engine. Extra keyword arguments are passed to
+        xr.Dataset.to_netcdf, e.g. compute=False to obtain a delayed write
+        for a dask-backed archive (see from_files_delayed) that streams
+        chunk by chunk when computed.
+
         Args:
             filename (str): filename of the NetCDF archive of ragged arrays
+            engine (str, optional): engine used by xarray to write the file (Defaults to "h5netcdf")
+
+        Returns:
+            the value returned by xr.Dataset.to_netcdf, i.e. None or a
+            dask.delayed.Delayed when compute=False
         """
+        if engine == "h5netcdf":
+            try:
+                import h5netcdf  # noqa: F401
+            except ImportError:
+                engine = None  # let xarray pick its default engine
 
-        self.to_xarray().to_netcdf(filename)
-        return
+        return self.to_xarray().to_netcdf(filename, engine=engine, **kwargs)
 
 
 def unpack_ragged(
@@ -339,5 +534,155 @@ def unpack_ragged(
         )):
             u, v = velocity_from_position(lon, lat, time)
     """
-    indices = np.insert(np.cumsum(np.array(rowsize)), 0, 0)
-    return [ragged_array[indices[n] : indices[n + 1]] for n in range(indices.size - 1)]
\ No newline at end of file
+    cuts = np.cumsum(np.asarray(rowsize), dtype=np.intp)
+    if isinstance(ragged_array, np.ndarray) and ragged_array.dtype.kind in "biuf":
+        return _split_views(ragged_array, cuts)
+    return np.split(ragged_array, cuts)[:-1]
+
+
+def unpack_many(
+    arrays: list[np.ndarray], rowsize: np.ndarray[int]
+) -> list[list[np.ndarray]]:
+    """Unpack several ragged arrays sharing the same rowsize.
+
+    The cumulative sum of rowsize is computed once and reused for every
+    array, so unpacking e.g. lon/lat/time together is cheaper than three
+    separate calls to ``unpack_ragged``.
+
+    Parameters
+    ----------
+    arrays : list of array-like
+        Ragged arrays to unpack, all of the same total length
+    rowsize : array-like
+        An array of integers whose values is the size of each row in the
+        ragged arrays
+
+    Returns
+    -------
+    list
+        One list of row arrays per input array, in the same order
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        lons, lats, times = unpack_many(
+            [ds.lon.values, ds.lat.values, ds.time.values], ds.rowsize
+        )
+    """
+    cuts = np.cumsum(np.asarray(rowsize), dtype=np.intp)
+    return [np.split(a, cuts)[:-1] for a in arrays]
+
+
+def unpack_ragged_iter(ragged_array: np.ndarray, rowsize: np.ndarray[int]):
+    """Iterate over the rows of a ragged array without building a list.
+
+    Yields zero-copy views into ragged_array, so looping over trajectories
+    costs O(1) memory instead of the O(N) list that ``unpack_ragged``
+    materializes. When all rows have the same size, the rows of a single
+    free reshape are yielded instead of computing any offsets.
+
+    Parameters
+    ----------
+    ragged_array : array-like
+        A ragged_array to unpack
+    rowsize : array-like
+        An array of integers whose values is the size of each row in the
+        ragged array
+
+    Yields
+    ------
+    np.ndarray
+        One view per row, with sizes that correspond to the values in rowsize
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        for lon in unpack_ragged_iter(ds.lon.values, ds.rowsize):
+            ...
+    """
+    rowsize = np.asarray(rowsize)
+    if rowsize.size and rowsize.min() == rowsize.max():
+        yield from ragged_array.reshape(rowsize.size, -1)
+        return
+
+    start = 0
+    for size in rowsize:
+        stop = start + size
+        yield ragged_array[start:stop]
+        start = stop
+
+
+def unpack_ragged_ufunc(
+    func: Callable, ragged_array: np.ndarray, rowsize: np.ndarray[int]
+) -> np.ndarray:
+    """Reduce every row of a ragged array without unpacking it.
+
+    When func is a numpy ufunc (np.add, np.maximum, ...), the per-row
+    reduction runs through ufunc.reduceat directly on the flat array, so
+    no row views, lists, or intermediate arrays are ever materialized.
+    Any other callable is applied to zero-copy row views instead.
+
+    Zero-length rows reduce to the identity of the ufunc (0 for np.add,
+    1 for np.multiply, ...); a ufunc without an identity (np.maximum,
+    ...) raises ValueError on them, like reducing an empty array does.
+
+    Parameters
+    ----------
+    func : np.ufunc or Callable
+        A binary ufunc to reduce over each row, or a callable mapping a
+        row array to a scalar
+    ragged_array : array-like
+        A ragged_array to reduce
+    rowsize : array-like
+        An array of integers whose values is the size of each row in the
+        ragged array
+
+    Returns
+    -------
+    np.ndarray
+        One reduced value per row
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        mean_lon = (
+            unpack_ragged_ufunc(np.add, ds.lon.values, ds.rowsize)
+            / ds.rowsize
+        )
+    """
+    rowsize = np.asarray(rowsize)
+    cuts = np.cumsum(rowsize, dtype=np.intp)
+    if cuts.size == 0:
+        return np.array([])
+
+    starts = np.empty(cuts.size, dtype=np.intp)
+    starts[0] = 0
+    starts[1:] = cuts[:-1]
+
+    if isinstance(func, np.ufunc):
+        nonzero = rowsize > 0
+        if nonzero.all():
+            return func.reduceat(ragged_array, starts)
+
+        # reduceat maps a zero-length row to the element at its start
+        # index (the first value of the next row); reduce the non-empty
+        # rows only and give the empty ones the identity of the ufunc
+        if func.identity is None:
+            raise ValueError(
+                f"zero-length rows cannot be reduced by {func}, "
+                "which has no identity"
+            )
+        reduced = func.reduceat(ragged_array, starts[nonzero])
+        res = np.full(rowsize.size, func.identity, dtype=reduced.dtype)
+        res[nonzero] = reduced
+        return res
+
+    return np.array(
+        [func(ragged_array[start:stop]) for start, stop in zip(starts, cuts)]
+    )
\ No newline at end of file
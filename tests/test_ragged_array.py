@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""
+Created on 2026.08.27
+
+@author: MiniUFO
+Copyright 2018. All rights reserved. Use is subject to license terms.
+"""
+import os
+import sys
+import numpy as np
+import xarray as xr
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "paper"))
+
+from RaggedArray import RaggedArray, unpack_ragged, unpack_many, unpack_ragged_ufunc
+
+def test_from_xarray_classification():
+    ds = xr.Dataset(
+        coords={"time": ("obs", np.arange(4.0))},
+        data_vars={
+            "ID": ("traj", np.arange(2)),
+            "lon": ("obs", np.arange(4.0)),
+            "dist": (("traj", "obs"), np.zeros((2, 4))),
+        },
+    )
+    ra = RaggedArray.from_xarray(ds)
+
+    assert "ID" in ra.metadata
+    # a variable carrying both dims is ragged data, not per-trajectory metadata
+    assert "lon" in ra.data and "dist" in ra.data
+
+def test_unpack_ragged_dataarray_rowsize():
+    flat = np.arange(10.0)
+    rowsize = xr.DataArray(np.array([3, 2, 5]), dims="traj")
+
+    # ndarray input with DataArray rowsize, as in the docstring example
+    rows = unpack_ragged(flat, rowsize)
+    assert len(rows) == 3
+    assert all(np.array_equal(r, e)
+               for r, e in zip(rows, [flat[:3], flat[3:5], flat[5:]]))
+
+    # DataArray input goes through the np.split branch
+    rows = unpack_ragged(xr.DataArray(flat, dims="obs"), rowsize)
+    assert len(rows) == 3
+    assert all(isinstance(r, xr.DataArray) for r in rows)
+    assert np.array_equal(rows[2].values, flat[5:])
+
+def test_unpack_many_dataarray_rowsize():
+    flat = np.arange(10.0)
+    rowsize = xr.DataArray(np.array([3, 2, 5]), dims="traj")
+
+    lons, lats = unpack_many([flat, flat * 2], rowsize)
+    assert len(lons) == 3 and len(lats) == 3
+    assert np.array_equal(lons[1], flat[3:5])
+    assert np.array_equal(lats[2], flat[5:] * 2)
+
+def test_unpack_ragged_empty_rowsize():
+    empty = np.array([], dtype=int)
+
+    # every branch returns no rows, not one whole-input segment
+    assert unpack_ragged(np.array([]), empty) == []
+    assert unpack_ragged(xr.DataArray(np.array([]), dims="obs"), empty) == []
+    assert unpack_ragged(np.array([], dtype="datetime64[ns]"), empty) == []
+
+    lons, lats = unpack_many([np.array([]), np.array([])], empty)
+    assert lons == [] and lats == []
+
+def test_unpack_ragged_ufunc():
+    flat = np.arange(9.0)
+
+    # DataArray rowsize works in the non-ufunc fallback too
+    rowsize = xr.DataArray(np.array([3, 6]), dims="traj")
+    assert np.array_equal(unpack_ragged_ufunc(np.add, flat, rowsize), [3, 33])
+    assert np.array_equal(unpack_ragged_ufunc(np.mean, flat, rowsize), [1, 5.5])
+
+    # empty rowsize reduces to nothing, like unpack_ragged returns []
+    assert unpack_ragged_ufunc(np.add, flat[:0], np.array([], dtype=int)).size == 0
+
+    # zero-length rows get the identity of the ufunc, not a stray element
+    rowsize = np.array([3, 0, 6])
+    assert np.array_equal(unpack_ragged_ufunc(np.add, flat, rowsize), [3, 0, 33])
+    assert np.array_equal(unpack_ragged_ufunc(np.multiply, flat, rowsize),
+                          [0, 1, 3 * 4 * 5 * 6 * 7 * 8])
+
+    # a ufunc without an identity cannot reduce an empty row
+    try:
+        unpack_ragged_ufunc(np.maximum, flat, rowsize)
+        assert False, "expected ValueError"
+    except ValueError:
+        pass